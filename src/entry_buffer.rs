@@ -0,0 +1,146 @@
+use std::collections::VecDeque;
+use crate::{NssError, NssResult};
+
+/// Number of entries fetched from NSS each time an iterator's buffer runs dry
+pub const ITER_BATCH_SIZE: usize = 64;
+
+/// Read-ahead buffer over an NSS enumeration.
+///
+/// Entries are fetched from NSS in batches, so that callers such as the Python
+/// iterators only release the GIL and call into NSS once per batch, not once
+/// per entry.
+/// An error hit while filling the buffer is held back until the entries
+/// fetched before it have been handed out.
+pub struct EntryBuffer<T, I> {
+    inner: I,
+    buffer: VecDeque<T>,
+    pending_error: Option<NssError>,
+    exhausted: bool,
+}
+
+impl<T, I: Iterator<Item = NssResult<T>>> EntryBuffer<T, I> {
+    #[must_use]
+    pub fn new(inner: I) -> Self {
+        EntryBuffer {
+            inner,
+            buffer: VecDeque::with_capacity(ITER_BATCH_SIZE),
+            pending_error: None,
+            exhausted: false,
+        }
+    }
+
+    /// Whether the next call to `next_entry()` has to call into NSS.
+    #[must_use]
+    pub fn needs_fetch(&self) -> bool {
+        self.buffer.is_empty() && self.pending_error.is_none() && !self.exhausted
+    }
+
+    /// Return the next entry, fetching a new batch if the buffer is empty.
+    pub fn next_entry(&mut self) -> Option<NssResult<T>> {
+        if self.needs_fetch() {
+            self.fill(ITER_BATCH_SIZE);
+        }
+
+        match self.buffer.pop_front() {
+            Some(entry) => Some(Ok(entry)),
+            None => self.pending_error.take().map(Err),
+        }
+    }
+
+    /// Return up to `count` entries. An empty result means the enumeration is exhausted.
+    ///
+    /// `count` must be non-zero, since an empty batch would read as exhaustion;
+    /// the Python bindings reject zero before calling this.
+    ///
+    /// # Errors
+    /// Returns the pending `NssError` if it is reached before any entry was collected.
+    /// Otherwise the error is kept for the following call.
+    pub fn next_batch(&mut self, count: usize) -> NssResult<Vec<T>> {
+        if self.buffer.len() < count && self.pending_error.is_none() && !self.exhausted {
+            self.fill(count - self.buffer.len());
+        }
+
+        let available = count.min(self.buffer.len());
+        if available == 0 && count > 0 {
+            if let Some(e) = self.pending_error.take() {
+                return Err(e);
+            }
+        }
+
+        Ok(self.buffer.drain(..available).collect())
+    }
+
+    fn fill(&mut self, count: usize) {
+        for _ in 0..count {
+            match self.inner.next() {
+                Some(Ok(entry)) => self.buffer.push_back(entry),
+                Some(Err(e)) => {
+                    self.pending_error = Some(e);
+                    return;
+                }
+                None => {
+                    self.exhausted = true;
+                    return;
+                }
+            }
+        }
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn entries(count: u32) -> impl Iterator<Item = NssResult<u32>> {
+        (0..count).map(Ok)
+    }
+
+    #[test]
+    fn test_next_yields_all_entries() {
+        let mut buffer = EntryBuffer::new(entries(ITER_BATCH_SIZE as u32 + 3));
+        assert!(buffer.needs_fetch());
+
+        assert_eq!(buffer.next_entry().unwrap().unwrap(), 0);
+        assert!(!buffer.needs_fetch());
+
+        let mut count = 1;
+        while let Some(entry) = buffer.next_entry() {
+            assert_eq!(entry.unwrap(), count);
+            count += 1;
+        }
+        assert_eq!(count, ITER_BATCH_SIZE as u32 + 3);
+        assert!(!buffer.needs_fetch());
+    }
+
+    #[test]
+    fn test_error_raised_after_buffered_entries() {
+        let source = vec![Ok(1u32), Ok(2), Err(NssError::InvalidUtf8), Ok(3)];
+        let mut buffer = EntryBuffer::new(source.into_iter());
+
+        assert_eq!(buffer.next_entry().unwrap().unwrap(), 1);
+        assert_eq!(buffer.next_entry().unwrap().unwrap(), 2);
+        assert!(matches!(buffer.next_entry(), Some(Err(NssError::InvalidUtf8))));
+        assert_eq!(buffer.next_entry().unwrap().unwrap(), 3);
+        assert!(buffer.next_entry().is_none());
+    }
+
+    #[test]
+    fn test_next_batch() {
+        let mut buffer = EntryBuffer::new(entries(10));
+        assert_eq!(buffer.next_entry().unwrap().unwrap(), 0);
+
+        assert_eq!(buffer.next_batch(4).unwrap(), vec![1, 2, 3, 4]);
+        assert_eq!(buffer.next_batch(100).unwrap(), vec![5, 6, 7, 8, 9]);
+        assert!(buffer.next_batch(100).unwrap().is_empty());
+    }
+
+    #[test]
+    fn test_next_batch_error() {
+        let source = vec![Ok(1u32), Err(NssError::InvalidUtf8)];
+        let mut buffer = EntryBuffer::new(source.into_iter());
+
+        assert_eq!(buffer.next_batch(4).unwrap(), vec![1]);
+        assert!(matches!(buffer.next_batch(4), Err(NssError::InvalidUtf8)));
+        assert!(buffer.next_batch(4).unwrap().is_empty());
+    }
+}
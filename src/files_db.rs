@@ -0,0 +1,305 @@
+//! Bulk parsing of the flat files backing the FILES NSS module.
+//!
+//! Enumerating through `libnss_files` costs one NSS call per entry. For
+//! `getpwall`/`getgrall` the whole file is instead read at once and parsed
+//! here, following the line rules of glibc's `nss_files` parser.
+
+use memchr::{memchr, memchr_iter};
+
+use crate::{GroupEntry, NssError, NssModule, NssResult, PasswdEntry};
+
+pub const PASSWD_FILE_PATH: &str = "/etc/passwd";
+pub const GROUP_FILE_PATH: &str = "/etc/group";
+
+/// Split `data` on every occurrence of `sep`.
+///
+/// Separators are located with `memchr`, which scans with SIMD instructions
+/// (SSE2/AVX2 selected at runtime) instead of testing byte by byte.
+fn split_on(sep: u8, data: &[u8]) -> impl Iterator<Item = &[u8]> {
+    let mut start = 0;
+    memchr_iter(sep, data)
+        .chain(std::iter::once(data.len()))
+        .map(move |end| {
+            let part = &data[start..end];
+            start = end + 1;
+            part
+        })
+}
+
+/// Iterate over the lines of a database file, skipping blank and comment lines.
+///
+/// Leading whitespace is stripped, matching `nss_files`.
+fn db_lines(data: &[u8]) -> impl Iterator<Item = &[u8]> {
+    split_on(b'\n', data)
+        .map(<[u8]>::trim_ascii_start)
+        .filter(|line| !line.is_empty() && line[0] != b'#')
+}
+
+/// Split a line into `N` colon-separated fields.
+///
+/// Missing trailing fields are returned empty and the last field holds the
+/// remainder of the line, as with the `STRING_FIELD` parser in `nss_files`.
+fn split_fields<const N: usize>(line: &[u8]) -> [&[u8]; N] {
+    let mut fields: [&[u8]; N] = [&[]; N];
+    let mut colons = memchr_iter(b':', line);
+    let mut start = 0;
+    for field in fields.iter_mut().take(N - 1) {
+        let Some(pos) = colons.next() else {
+            *field = &line[start..];
+            return fields;
+        };
+        *field = &line[start..pos];
+        start = pos + 1;
+    }
+    fields[N - 1] = &line[start..];
+    fields
+}
+
+fn field_str(field: &[u8]) -> NssResult<String> {
+    std::str::from_utf8(field)
+        .map(str::to_string)
+        .map_err(|_| NssError::InvalidUtf8)
+}
+
+/// Parse a decimal uid/gid field directly from bytes.
+///
+/// Like the `strtoul` call behind `nss_files`' `INT_FIELD`, leading
+/// whitespace and a single leading `+` are accepted.
+fn field_id(field: &[u8]) -> Option<u32> {
+    // C isspace() also counts vertical tab, which is_ascii_whitespace() does not
+    let start = field.iter().position(|&b| !(b.is_ascii_whitespace() || b == b'\x0b'))?;
+    let digits = field[start..].strip_prefix(b"+").unwrap_or(&field[start..]);
+    if digits.is_empty() {
+        return None;
+    }
+
+    digits.iter().try_fold(0u32, |acc, &b| {
+        let digit = b.wrapping_sub(b'0');
+        if digit > 9 {
+            return None;
+        }
+        acc.checked_mul(10)?.checked_add(u32::from(digit))
+    })
+}
+
+/// Lines starting with `+` or `-` are NIS compat entries for `nss_compat`.
+///
+/// `nss_files` still returns them, but parses their ids more leniently.
+fn is_compat_entry(name: &[u8]) -> bool {
+    matches!(name.first(), Some(b'+' | b'-'))
+}
+
+/// Whether a compat line holds only the entry name (e.g. a lone `+`), which
+/// `nss_files` returns with ids of 0 and all other fields empty.
+fn is_name_only(line: &[u8]) -> bool {
+    memchr(b':', line).is_none_or(|pos| pos + 1 == line.len())
+}
+
+/// Parse an id field of a compat entry, as `INT_FIELD_MAYBE_NULL` does.
+///
+/// An empty field reads as 0, but only if the line continues after it
+/// (`terminated`); otherwise the line is skipped.
+fn compat_field_id(field: &[u8], terminated: bool) -> Option<u32> {
+    if field.is_empty() {
+        return terminated.then_some(0);
+    }
+    field_id(field)
+}
+
+fn parse_passwd_line(line: &[u8]) -> NssResult<Option<PasswdEntry>> {
+    let [name, _passwd, uid, gid, gecos, dir, shell] = split_fields::<7>(line);
+
+    let ids = if !is_compat_entry(name) {
+        field_id(uid).zip(field_id(gid))
+    } else if is_name_only(line) {
+        Some((0, 0))
+    } else {
+        let colons = memchr_iter(b':', line).count();
+        compat_field_id(uid, colons > 2).zip(compat_field_id(gid, colons > 3))
+    };
+
+    // Lines with a malformed uid or gid are skipped, as nss_files does
+    let Some((pw_uid, pw_gid)) = ids else {
+        return Ok(None);
+    };
+
+    Ok(Some(PasswdEntry {
+        pw_name: field_str(name)?,
+        pw_uid,
+        pw_gid,
+        pw_gecos: field_str(gecos)?,
+        pw_dir: field_str(dir)?,
+        pw_shell: field_str(shell)?,
+        source: NssModule::Files.upper_name().to_string(),
+    }))
+}
+
+fn parse_group_line(line: &[u8]) -> NssResult<Option<GroupEntry>> {
+    let [name, _passwd, gid, members] = split_fields::<4>(line);
+
+    let gr_gid = if !is_compat_entry(name) {
+        field_id(gid)
+    } else if is_name_only(line) {
+        Some(0)
+    } else {
+        compat_field_id(gid, memchr_iter(b':', line).count() > 2)
+    };
+
+    let Some(gr_gid) = gr_gid else {
+        return Ok(None);
+    };
+
+    let gr_mem = split_on(b',', members)
+        .map(<[u8]>::trim_ascii_start)
+        .filter(|member| !member.is_empty())
+        .map(field_str)
+        .collect::<NssResult<Vec<_>>>()?;
+
+    Ok(Some(GroupEntry {
+        gr_name: field_str(name)?,
+        gr_gid,
+        gr_mem,
+        source: NssModule::Files.upper_name().to_string(),
+    }))
+}
+
+/// Parse the contents of a passwd file.
+///
+/// # Errors
+/// Returns `NssError::InvalidUtf8` if a field is not valid UTF-8.
+pub fn parse_passwd_file(data: &[u8]) -> NssResult<Vec<PasswdEntry>> {
+    db_lines(data)
+        .filter_map(|line| parse_passwd_line(line).transpose())
+        .collect()
+}
+
+/// Parse the contents of a group file.
+///
+/// # Errors
+/// Returns `NssError::InvalidUtf8` if a field is not valid UTF-8.
+pub fn parse_group_file(data: &[u8]) -> NssResult<Vec<GroupEntry>> {
+    db_lines(data)
+        .filter_map(|line| parse_group_line(line).transpose())
+        .collect()
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    const PASSWD_DATA: &[u8] = b"root:x:0:0:root:/root:/bin/bash\n\
+        # comment line\n\
+        \n\
+        \x20 daemon:x:1:1:daemon:/usr/sbin:/usr/sbin/nologin\n\
+        broken:x:abc:1:Broken:/:/bin/false\n\
+        short:x:1000:1000\n\
+        space:x: 5:5::/:/bin/sh\n\
+        plus:x:+7:+7::/:/bin/sh\n\
+        nonewline:x:1001:1001:No Newline:/home/nonewline:/bin/sh";
+
+    const GROUP_DATA: &[u8] = b"root:x:0:\n\
+        wheel:x:10:alice, bob,,carol\n\
+        #disabled:x:11:\n\
+        broken:x::alice\n\
+        users:x:100:dave";
+
+    #[test]
+    fn test_parse_passwd_file() {
+        let entries = parse_passwd_file(PASSWD_DATA).unwrap();
+        let names: Vec<&str> = entries.iter().map(|e| e.pw_name.as_str()).collect();
+        assert_eq!(names, vec!["root", "daemon", "short", "space", "plus", "nonewline"]);
+
+        let root = &entries[0];
+        assert_eq!(root.pw_uid, 0);
+        assert_eq!(root.pw_gid, 0);
+        assert_eq!(root.pw_gecos, "root");
+        assert_eq!(root.pw_dir, "/root");
+        assert_eq!(root.pw_shell, "/bin/bash");
+        assert_eq!(root.source, "FILES");
+
+        let short = &entries[2];
+        assert_eq!(short.pw_uid, 1000);
+        assert_eq!(short.pw_gecos, "");
+        assert_eq!(short.pw_shell, "");
+
+        assert_eq!((entries[3].pw_uid, entries[3].pw_gid), (5, 5));
+        assert_eq!((entries[4].pw_uid, entries[4].pw_gid), (7, 7));
+        assert_eq!(entries[5].pw_shell, "/bin/sh");
+    }
+
+    #[test]
+    fn test_parse_group_file() {
+        let entries = parse_group_file(GROUP_DATA).unwrap();
+        let names: Vec<&str> = entries.iter().map(|e| e.gr_name.as_str()).collect();
+        assert_eq!(names, vec!["root", "wheel", "users"]);
+
+        assert!(entries[0].gr_mem.is_empty());
+        assert_eq!(entries[1].gr_gid, 10);
+        assert_eq!(entries[1].gr_mem, vec!["alice", "bob", "carol"]);
+        assert_eq!(entries[2].gr_mem, vec!["dave"]);
+        assert_eq!(entries[2].source, "FILES");
+    }
+
+    #[test]
+    fn test_parse_compat_entries() {
+        // Expected results were checked against libnss_files' getpwent_r/getgrent_r
+        let passwd = parse_passwd_file(b"+nisuser::::::\n\
+            -baduser:x:::::\n\
+            +\n\
+            +foo:x:12:34:g:/h:/s\n\
+            +bad:x:abc:1::/:/bin/sh\n\
+            -short:x\n").unwrap();
+        let users: Vec<(&str, u32, u32)> = passwd.iter()
+            .map(|e| (e.pw_name.as_str(), e.pw_uid, e.pw_gid))
+            .collect();
+        assert_eq!(users, vec![("+nisuser", 0, 0), ("-baduser", 0, 0), ("+", 0, 0), ("+foo", 12, 34)]);
+        assert_eq!(passwd[2].pw_shell, "");
+
+        let group = parse_group_file(b"+\n\
+            +nisgrp::\n\
+            -bad:x::a,b\n\
+            +g:x:+9:m\n\
+            +junk:x:zz:\n").unwrap();
+        let groups: Vec<(&str, u32)> = group.iter().map(|e| (e.gr_name.as_str(), e.gr_gid)).collect();
+        assert_eq!(groups, vec![("+", 0), ("-bad", 0), ("+g", 9)]);
+        assert_eq!(group[1].gr_mem, vec!["a", "b"]);
+    }
+
+    #[test]
+    fn test_parse_invalid_utf8() {
+        assert!(matches!(
+            parse_passwd_file(b"r\xffot:x:0:0::/root:/bin/sh\n"),
+            Err(NssError::InvalidUtf8)
+        ));
+    }
+
+    #[test]
+    fn test_split_fields() {
+        assert_eq!(split_fields::<3>(b"a:b:c:d"), [&b"a"[..], b"b", b"c:d"]);
+        assert_eq!(split_fields::<3>(b"a"), [&b"a"[..], b"", b""]);
+        assert_eq!(split_fields::<3>(b"a:"), [&b"a"[..], b"", b""]);
+        assert_eq!(split_fields::<3>(b""), [&b""[..], b"", b""]);
+    }
+
+    #[test]
+    fn test_field_id() {
+        assert_eq!(field_id(b"0"), Some(0));
+        assert_eq!(field_id(b"4294967295"), Some(u32::MAX));
+        assert_eq!(field_id(b"4294967296"), None);
+        assert_eq!(field_id(b""), None);
+        assert_eq!(field_id(b"-1"), None);
+        assert_eq!(field_id(b"12a"), None);
+        assert_eq!(field_id(b" 5"), Some(5));
+        assert_eq!(field_id(b"\t+7"), Some(7));
+        assert_eq!(field_id(b"+"), None);
+        assert_eq!(field_id(b"  "), None);
+        assert_eq!(field_id(b"+-1"), None);
+        assert_eq!(field_id(b"5 "), None);
+    }
+
+    #[test]
+    fn test_empty_file() {
+        assert!(parse_passwd_file(b"").unwrap().is_empty());
+        assert!(parse_group_file(b"\n\n").unwrap().is_empty());
+    }
+}
@@ -1,9 +1,10 @@
 use libc::{c_char, c_int, gid_t, group};
-use std::ffi::{CStr, CString};
+use std::ffi::CStr;
 use std::mem;
 
 use crate::{NssError, NssResult, NssModule, NssOperation, NssReturnCode};
-use crate::nss_common::get_nss_function;
+use crate::nss_common::{CNameBuf, get_nss_function};
+use crate::files_db::{GROUP_FILE_PATH, parse_group_file};
 
 const GROUP_INIT_BUFLEN: usize = 1024;
 
@@ -76,7 +77,7 @@ unsafe fn getgrnam_r_impl(
     let func_ptr = get_nss_function(NssOperation::GetGrNam, module)?;
     let getgrnam_r: GetGrNameFn = mem::transmute(func_ptr);
 
-    let name_c = CString::new(name).map_err(|_| NssError::InvalidUtf8)?;
+    let name_c = CNameBuf::new(name)?;
     let mut result: group = mem::zeroed();
     let mut buffer = vec![0u8; buffer_len];
     let mut errno: c_int = 0;
@@ -380,34 +381,75 @@ pub fn itergrp(module: NssModule) -> GroupIterator {
     GroupIterator::new(module)
 }
 
-/// Get all group entries from the specified NSS module(s).
+/// Enumerate all group entries from a single NSS module.
 ///
-/// # Errors
-/// Returns `NssError` if NSS operation fails.
-pub fn getgrall(module: Option<NssModule>) -> NssResult<Vec<GroupEntry>> {
-    let modules = match module {
-        Some(m) => vec![m],
-        None => vec![NssModule::Files, NssModule::Sss, NssModule::Winbind],
-    };
-
-    let mut all_entries = Vec::new();
+/// Modules that are unavailable (e.g., winbind/sss not installed) yield no entries.
+fn getgrall_module(module: NssModule) -> NssResult<Vec<GroupEntry>> {
+    if module == NssModule::Files {
+        // Read the whole file at once rather than one NSS call per entry.
+        // If it cannot be read, fall back to enumerating through libnss_files.
+        if let Ok(data) = std::fs::read(GROUP_FILE_PATH) {
+            return parse_group_file(&data);
+        }
+    }
 
-    for mod_enum in modules {
-        let mut entries = Vec::new();
-        for result in itergrp(mod_enum) {
-            match result {
-                Ok(entry) => entries.push(entry),
-                Err(NssError::NssOperationFailed { return_code: NssReturnCode::Unavail, .. }) => break,
-                Err(NssError::LibraryError(_)) => {
-                    // Library not available (e.g., winbind/sss not installed), skip this module
-                    break;
-                }
-                Err(e) => return Err(e),
+    let mut entries = Vec::new();
+    for result in itergrp(module) {
+        match result {
+            Ok(entry) => entries.push(entry),
+            Err(NssError::NssOperationFailed { return_code: NssReturnCode::Unavail, .. }) => break,
+            Err(NssError::LibraryError(_)) => {
+                // Library not available (e.g., winbind/sss not installed), skip this module
+                break;
             }
+            Err(e) => return Err(e),
         }
-        all_entries.extend(entries);
     }
 
+    Ok(entries)
+}
+
+/// Get all group entries from the specified NSS module(s), grouped by module.
+///
+/// # Errors
+/// Returns `NssError` if NSS operation fails.
+///
+/// # Panics
+/// Re-raises a panic from one of the per-module enumeration threads.
+pub fn getgrall_by_module(module: Option<NssModule>) -> NssResult<Vec<(NssModule, Vec<GroupEntry>)>> {
+    if let Some(mod_enum) = module {
+        return Ok(vec![(mod_enum, getgrall_module(mod_enum)?)]);
+    }
+
+    // The modules are independent and SSS/winbind each wait on their daemon,
+    // so enumerate them concurrently. Each module keeps its own enumeration
+    // state, so the threads do not share a cursor.
+    std::thread::scope(|scope| {
+        let handles: Vec<_> = [NssModule::Files, NssModule::Sss, NssModule::Winbind]
+            .into_iter()
+            .map(|mod_enum| (mod_enum, scope.spawn(move || getgrall_module(mod_enum))))
+            .collect();
+
+        handles
+            .into_iter()
+            .map(|(mod_enum, handle)| {
+                let entries = handle.join().unwrap_or_else(|e| std::panic::resume_unwind(e))?;
+                Ok((mod_enum, entries))
+            })
+            .collect()
+    })
+}
+
+/// Get all group entries from the specified NSS module(s).
+///
+/// # Errors
+/// Returns `NssError` if NSS operation fails.
+pub fn getgrall(module: Option<NssModule>) -> NssResult<Vec<GroupEntry>> {
+    let all_entries = getgrall_by_module(module)?
+        .into_iter()
+        .flat_map(|(_, entries)| entries)
+        .collect();
+
     Ok(all_entries)
 }
 
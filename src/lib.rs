@@ -3,14 +3,17 @@ pub mod error;
 pub mod nss_common;
 pub mod passwd;
 pub mod group;
+pub mod files_db;
+pub mod entry_buffer;
+pub mod lookup_cache;
 
 #[cfg(feature = "python")]
 pub mod python_bindings;
 
 pub use error::{NssError, NssResult};
 pub use nss_common::{NssModule, NssOperation, NssReturnCode};
-pub use passwd::{PasswdEntry, PasswdIterator, getpwnam, getpwuid, getpwall, iterpw};
-pub use group::{GroupEntry, GroupIterator, getgrnam, getgrgid, getgrall, itergrp};
+pub use passwd::{PasswdEntry, PasswdIterator, PasswdLookup, getpwnam, getpwuid, getpwall, getpwall_by_module, iterpw};
+pub use group::{GroupEntry, GroupIterator, getgrnam, getgrgid, getgrall, getgrall_by_module, itergrp};
 
 #[cfg(feature = "python")]
 use pyo3::prelude::*;
@@ -0,0 +1,192 @@
+use std::borrow::Borrow;
+use std::collections::{BTreeMap, HashMap};
+use std::hash::Hash;
+use std::time::{Duration, Instant};
+
+/// Default number of entries kept by a lookup cache
+pub const DEFAULT_CACHE_SIZE: usize = 256;
+
+/// Default lifetime of a cached entry in milliseconds (nscd's positive-time-to-live)
+pub const DEFAULT_CACHE_TTL_MS: u64 = 600_000;
+
+struct CacheSlot<V> {
+    value: V,
+    inserted: Instant,
+    last_used: u64,
+}
+
+/// Size-bounded lookup cache with per-entry expiry.
+///
+/// When the cache is full the least recently used entry is evicted. Expired
+/// entries are dropped when they are next looked up. Recency is tracked in an
+/// ordered index, so lookups, inserts and evictions take O(log n) time.
+pub struct LookupCache<K, V> {
+    max_entries: usize,
+    ttl: Duration,
+    clock: u64,
+    entries: HashMap<K, CacheSlot<V>>,
+    // Keys ordered by their last use, oldest first
+    recency: BTreeMap<u64, K>,
+}
+
+impl<K: Clone + Eq + Hash, V: Clone> LookupCache<K, V> {
+    #[must_use]
+    pub fn new() -> Self {
+        LookupCache {
+            max_entries: DEFAULT_CACHE_SIZE,
+            ttl: Duration::from_millis(DEFAULT_CACHE_TTL_MS),
+            clock: 0,
+            entries: HashMap::new(),
+            recency: BTreeMap::new(),
+        }
+    }
+
+    /// Change the cache limits, dropping all cached entries.
+    pub fn configure(&mut self, max_entries: usize, ttl: Duration) {
+        self.max_entries = max_entries;
+        self.ttl = ttl;
+        self.clear();
+    }
+
+    /// Look up `key`, which may be any borrowed form of the key type.
+    pub fn get<Q>(&mut self, key: &Q) -> Option<V>
+    where
+        K: Borrow<Q>,
+        Q: Eq + Hash + ?Sized,
+    {
+        let slot = self.entries.get_mut(key)?;
+        if slot.inserted.elapsed() >= self.ttl {
+            let last_used = slot.last_used;
+            self.entries.remove(key);
+            self.recency.remove(&last_used);
+            return None;
+        }
+
+        self.clock += 1;
+        let owned_key = self.recency.remove(&slot.last_used)?;
+        self.recency.insert(self.clock, owned_key);
+        slot.last_used = self.clock;
+        Some(slot.value.clone())
+    }
+
+    pub fn insert(&mut self, key: K, value: V) {
+        if self.max_entries == 0 {
+            return;
+        }
+
+        if self.entries.len() >= self.max_entries && !self.entries.contains_key(&key) {
+            self.evict_lru();
+        }
+
+        self.clock += 1;
+        self.recency.insert(self.clock, key.clone());
+        let slot = CacheSlot {
+            value,
+            inserted: Instant::now(),
+            last_used: self.clock,
+        };
+        if let Some(old) = self.entries.insert(key, slot) {
+            self.recency.remove(&old.last_used);
+        }
+    }
+
+    pub fn clear(&mut self) {
+        self.entries.clear();
+        self.recency.clear();
+    }
+
+    #[must_use]
+    pub fn len(&self) -> usize {
+        self.entries.len()
+    }
+
+    #[must_use]
+    pub fn is_empty(&self) -> bool {
+        self.entries.is_empty()
+    }
+
+    fn evict_lru(&mut self) {
+        if let Some((_, key)) = self.recency.pop_first() {
+            self.entries.remove(&key);
+        }
+    }
+}
+
+impl<K: Clone + Eq + Hash, V: Clone> Default for LookupCache<K, V> {
+    fn default() -> Self {
+        Self::new()
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_cache_hit_and_miss() {
+        let mut cache = LookupCache::new();
+        cache.insert("root", 0u32);
+
+        assert_eq!(cache.get(&"root"), Some(0));
+        assert_eq!(cache.get(&"nobody"), None);
+    }
+
+    #[test]
+    fn test_cache_evicts_least_recently_used() {
+        let mut cache = LookupCache::new();
+        cache.configure(2, Duration::from_secs(60));
+        cache.insert("a", 1u32);
+        cache.insert("b", 2u32);
+
+        // Touch "a" so that "b" becomes the eviction candidate
+        assert_eq!(cache.get(&"a"), Some(1));
+        cache.insert("c", 3u32);
+
+        assert_eq!(cache.len(), 2);
+        assert_eq!(cache.get(&"a"), Some(1));
+        assert_eq!(cache.get(&"b"), None);
+        assert_eq!(cache.get(&"c"), Some(3));
+    }
+
+    #[test]
+    fn test_cache_reinsert_and_borrowed_get() {
+        let mut cache: LookupCache<String, u32> = LookupCache::new();
+        cache.configure(2, Duration::from_secs(60));
+        cache.insert("a".to_string(), 1);
+        cache.insert("b".to_string(), 2);
+
+        // Replacing "a" makes it the most recently used entry
+        cache.insert("a".to_string(), 10);
+        cache.insert("c".to_string(), 3);
+
+        assert_eq!(cache.len(), 2);
+        assert_eq!(cache.get("a"), Some(10));
+        assert_eq!(cache.get("b"), None);
+        assert_eq!(cache.get("c"), Some(3));
+        assert_eq!(cache.recency.len(), cache.len());
+    }
+
+    #[test]
+    fn test_cache_expired_entries() {
+        let mut cache = LookupCache::new();
+        cache.configure(4, Duration::ZERO);
+        cache.insert("root", 0u32);
+
+        assert_eq!(cache.get(&"root"), None);
+        assert!(cache.is_empty());
+        assert!(cache.recency.is_empty());
+    }
+
+    #[test]
+    fn test_cache_zero_size_and_clear() {
+        let mut cache = LookupCache::new();
+        cache.configure(0, Duration::from_secs(60));
+        cache.insert("root", 0u32);
+        assert!(cache.is_empty());
+
+        cache.configure(4, Duration::from_secs(60));
+        cache.insert("root", 0u32);
+        cache.clear();
+        assert!(cache.is_empty());
+    }
+}
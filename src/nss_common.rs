@@ -1,5 +1,5 @@
-use libc::{c_int, dlopen, dlsym, RTLD_LAZY};
-use std::ffi::CString;
+use libc::{c_char, c_int, dlopen, dlsym, RTLD_LAZY};
+use std::ffi::{CStr, CString};
 use std::sync::{OnceLock, Mutex};
 use std::collections::HashMap;
 
@@ -56,6 +56,14 @@ impl NssModule {
         }
     }
 
+    /// Look up a module by name, ignoring ASCII case (e.g. "files" or "FILES").
+    #[must_use]
+    pub fn from_name(name: &str) -> Option<NssModule> {
+        [NssModule::Files, NssModule::Sss, NssModule::Winbind]
+            .into_iter()
+            .find(|module| module.name().eq_ignore_ascii_case(name))
+    }
+
     #[must_use]
     pub fn upper_name(&self) -> &'static str {
         match self {
@@ -66,6 +74,56 @@ impl NssModule {
     }
 }
 
+/// Names shorter than this are passed to NSS from a stack buffer
+const NAME_STACK_BUFLEN: usize = 256;
+
+/// NUL-terminated copy of a user or group name for passing to NSS.
+///
+/// Typical names fit in a stack buffer, so looking one up does not allocate.
+/// Longer names fall back to a heap-allocated `CString`.
+#[allow(clippy::large_enum_variant)] // The stack variant is the point of the type
+pub enum CNameBuf {
+    Stack([u8; NAME_STACK_BUFLEN]),
+    Heap(CString),
+}
+
+impl CNameBuf {
+    /// Copy `name` into a NUL-terminated buffer.
+    ///
+    /// # Errors
+    /// Returns `NssError::InvalidUtf8` if `name` contains a NUL byte.
+    pub fn new(name: &str) -> Result<Self, crate::NssError> {
+        let bytes = name.as_bytes();
+        if memchr::memchr(0, bytes).is_some() {
+            return Err(crate::NssError::InvalidUtf8);
+        }
+
+        if bytes.len() < NAME_STACK_BUFLEN {
+            let mut buf = [0u8; NAME_STACK_BUFLEN];
+            buf[..bytes.len()].copy_from_slice(bytes);
+            Ok(CNameBuf::Stack(buf))
+        } else {
+            CString::new(bytes)
+                .map(CNameBuf::Heap)
+                .map_err(|_| crate::NssError::InvalidUtf8)
+        }
+    }
+
+    #[must_use]
+    pub fn as_c_str(&self) -> &CStr {
+        match self {
+            // The name was checked for NUL bytes and the rest of the buffer is zeroed
+            CNameBuf::Stack(buf) => CStr::from_bytes_until_nul(buf).unwrap_or_default(),
+            CNameBuf::Heap(name) => name.as_c_str(),
+        }
+    }
+
+    #[must_use]
+    pub fn as_ptr(&self) -> *const c_char {
+        self.as_c_str().as_ptr()
+    }
+}
+
 #[derive(Debug, Clone, Copy, PartialEq, Eq, Hash)]
 pub enum NssOperation {
     GetGrNam,
@@ -249,6 +307,31 @@ mod tests {
         assert_eq!(NssModule::Winbind.upper_name(), "WINBIND");
     }
 
+    #[test]
+    fn test_nss_module_from_name() {
+        assert_eq!(NssModule::from_name("files"), Some(NssModule::Files));
+        assert_eq!(NssModule::from_name("SSS"), Some(NssModule::Sss));
+        assert_eq!(NssModule::from_name("WinBind"), Some(NssModule::Winbind));
+        assert_eq!(NssModule::from_name("ldap"), None);
+    }
+
+    #[test]
+    fn test_c_name_buf() {
+        let short = CNameBuf::new("root").unwrap();
+        assert!(matches!(short, CNameBuf::Stack(_)));
+        assert_eq!(short.as_c_str().to_bytes(), b"root");
+
+        let long_name = "a".repeat(NAME_STACK_BUFLEN);
+        let long = CNameBuf::new(&long_name).unwrap();
+        assert!(matches!(long, CNameBuf::Heap(_)));
+        assert_eq!(long.as_c_str().to_bytes(), long_name.as_bytes());
+
+        let longest_stack = "b".repeat(NAME_STACK_BUFLEN - 1);
+        assert_eq!(CNameBuf::new(&longest_stack).unwrap().as_c_str().to_bytes(), longest_stack.as_bytes());
+
+        assert!(matches!(CNameBuf::new("ro\0ot"), Err(crate::NssError::InvalidUtf8)));
+    }
+
     #[test]
     fn test_nss_operation_function_names() {
         assert_eq!(NssOperation::GetGrNam.function_name(), "getgrnam_r");
@@ -1,9 +1,10 @@
 use libc::{c_char, c_int, gid_t, uid_t, passwd};
-use std::ffi::{CStr, CString};
+use std::ffi::CStr;
 use std::mem;
 
 use crate::{NssError, NssResult, NssModule, NssOperation, NssReturnCode};
-use crate::nss_common::get_nss_function;
+use crate::nss_common::{CNameBuf, get_nss_function};
+use crate::files_db::{PASSWD_FILE_PATH, parse_passwd_file};
 
 const PASSWD_INIT_BUFLEN: usize = 1024;
 
@@ -84,58 +85,114 @@ type GetPwNameFn = unsafe extern "C" fn(
     errnop: *mut c_int,
 ) -> c_int;
 
-unsafe fn getpwnam_r_impl(
-    name: &str,
+/// Call a module's `getpwnam_r` with `buffer`, doubling the buffer on ERANGE.
+///
+/// The buffer keeps its grown size, so callers that reuse it do not hit
+/// ERANGE again for entries of a similar size.
+unsafe fn call_getpwnam_r(
+    getpwnam_r: GetPwNameFn,
+    name: &CStr,
     module: NssModule,
-    buffer_len: usize,
+    buffer: &mut Vec<u8>,
 ) -> NssResult<Option<PasswdEntry>> {
-    let func_ptr = get_nss_function(NssOperation::GetPwNam, module)?;
-    let getpwnam_r: GetPwNameFn = mem::transmute(func_ptr);
-
-    let name_c = CString::new(name).map_err(|_| NssError::InvalidUtf8)?;
-    let mut result: passwd = mem::zeroed();
-    let mut buffer = vec![0u8; buffer_len];
-    let mut errno: c_int = 0;
-
-    let ret_code = getpwnam_r(
-        name_c.as_ptr(),
-        &mut result,
-        buffer.as_mut_ptr().cast::<c_char>(),
-        buffer_len,
-        &mut errno,
-    );
+    loop {
+        let mut result: passwd = mem::zeroed();
+        let mut errno: c_int = 0;
+
+        let ret_code = getpwnam_r(
+            name.as_ptr(),
+            &mut result,
+            buffer.as_mut_ptr().cast::<c_char>(),
+            buffer.len(),
+            &mut errno,
+        );
+
+        match errno {
+            0 => {} // Success
+            libc::ERANGE => {
+                // Buffer too small, try with larger buffer
+                let buffer_len = buffer.len() * 2;
+                buffer.resize(buffer_len, 0);
+                continue;
+            }
+            _ => {
+                return Err(NssError::NssOperationFailed {
+                    errno: errno.unsigned_abs(),
+                    operation: NssOperation::GetPwNam,
+                    return_code: NssReturnCode::from(ret_code),
+                    module,
+                });
+            }
+        }
 
-    match errno {
-        0 => {} // Success
-        libc::ERANGE => {
-            // Buffer too small, try with larger buffer
-            return getpwnam_r_impl(name, module, buffer_len * 2);
+        let nss_code = NssReturnCode::from(ret_code);
+        if nss_code == NssReturnCode::NotFound {
+            return Ok(None);
         }
-        _ => {
+
+        if nss_code != NssReturnCode::Success {
             return Err(NssError::NssOperationFailed {
                 errno: errno.unsigned_abs(),
                 operation: NssOperation::GetPwNam,
-                return_code: NssReturnCode::from(ret_code),
+                return_code: nss_code,
                 module,
             });
         }
-    }
 
-    let nss_code = NssReturnCode::from(ret_code);
-    if nss_code == NssReturnCode::NotFound {
-        return Ok(None);
+        return parse_passwd_result(&result, &module);
     }
+}
 
-    if nss_code != NssReturnCode::Success {
-        return Err(NssError::NssOperationFailed {
-            errno: errno.unsigned_abs(),
-            operation: NssOperation::GetPwNam,
-            return_code: nss_code,
+unsafe fn getpwnam_r_impl(
+    name: &str,
+    module: NssModule,
+    buffer_len: usize,
+) -> NssResult<Option<PasswdEntry>> {
+    let func_ptr = get_nss_function(NssOperation::GetPwNam, module)?;
+    let getpwnam_r: GetPwNameFn = mem::transmute(func_ptr);
+
+    let name_c = CNameBuf::new(name)?;
+    let mut buffer = vec![0u8; buffer_len];
+    call_getpwnam_r(getpwnam_r, name_c.as_c_str(), module, &mut buffer)
+}
+
+/// Prepared lookup of users by name against a single NSS module.
+///
+/// The module's `getpwnam_r` is resolved once when the lookup is created, and
+/// the result buffer is kept between calls instead of being allocated per lookup.
+pub struct PasswdLookup {
+    module: NssModule,
+    getpwnam_r: GetPwNameFn,
+    buffer: Vec<u8>,
+}
+
+impl PasswdLookup {
+    /// Prepare lookups against `module`.
+    ///
+    /// # Errors
+    /// Returns `NssError::LibraryError` if the module or its `getpwnam_r` cannot be loaded.
+    pub fn new(module: NssModule) -> NssResult<Self> {
+        let func_ptr = unsafe { get_nss_function(NssOperation::GetPwNam, module)? };
+        Ok(PasswdLookup {
             module,
-        });
+            getpwnam_r: unsafe { mem::transmute::<*mut libc::c_void, GetPwNameFn>(func_ptr) },
+            buffer: vec![0u8; PASSWD_INIT_BUFLEN],
+        })
     }
 
-    parse_passwd_result(&result, &module)
+    #[must_use]
+    pub fn module(&self) -> NssModule {
+        self.module
+    }
+
+    /// Look up a user by name, returning `None` if the module has no such user.
+    ///
+    /// # Errors
+    /// Returns `NssError` if the NSS operation fails.
+    pub fn getpwnam(&mut self, name: &str) -> NssResult<Option<PasswdEntry>> {
+        let name_c = CNameBuf::new(name)?;
+        unsafe { call_getpwnam_r(self.getpwnam_r, name_c.as_c_str(), self.module, &mut self.buffer) }
+    }
 }
 
 type GetPwUidFn = unsafe extern "C" fn(
@@ -396,34 +453,75 @@ pub fn iterpw(module: NssModule) -> PasswdIterator {
     PasswdIterator::new(module)
 }
 
-/// Get all password entries from the specified NSS module(s).
+/// Enumerate all password entries from a single NSS module.
 ///
-/// # Errors
-/// Returns `NssError` if NSS operation fails.
-pub fn getpwall(module: Option<NssModule>) -> NssResult<Vec<PasswdEntry>> {
-    let modules = match module {
-        Some(m) => vec![m],
-        None => vec![NssModule::Files, NssModule::Sss, NssModule::Winbind],
-    };
-
-    let mut all_entries = Vec::new();
+/// Modules that are unavailable (e.g., winbind/sss not installed) yield no entries.
+fn getpwall_module(module: NssModule) -> NssResult<Vec<PasswdEntry>> {
+    if module == NssModule::Files {
+        // Read the whole file at once rather than one NSS call per entry.
+        // If it cannot be read, fall back to enumerating through libnss_files.
+        if let Ok(data) = std::fs::read(PASSWD_FILE_PATH) {
+            return parse_passwd_file(&data);
+        }
+    }
 
-    for mod_enum in modules {
-        let mut entries = Vec::new();
-        for result in iterpw(mod_enum) {
-            match result {
-                Ok(entry) => entries.push(entry),
-                Err(NssError::NssOperationFailed { return_code: NssReturnCode::Unavail, .. }) => break,
-                Err(NssError::LibraryError(_)) => {
-                    // Library not available (e.g., winbind/sss not installed), skip this module
-                    break;
-                }
-                Err(e) => return Err(e),
+    let mut entries = Vec::new();
+    for result in iterpw(module) {
+        match result {
+            Ok(entry) => entries.push(entry),
+            Err(NssError::NssOperationFailed { return_code: NssReturnCode::Unavail, .. }) => break,
+            Err(NssError::LibraryError(_)) => {
+                // Library not available (e.g., winbind/sss not installed), skip this module
+                break;
             }
+            Err(e) => return Err(e),
         }
-        all_entries.extend(entries);
     }
 
+    Ok(entries)
+}
+
+/// Get all password entries from the specified NSS module(s), grouped by module.
+///
+/// # Errors
+/// Returns `NssError` if NSS operation fails.
+///
+/// # Panics
+/// Re-raises a panic from one of the per-module enumeration threads.
+pub fn getpwall_by_module(module: Option<NssModule>) -> NssResult<Vec<(NssModule, Vec<PasswdEntry>)>> {
+    if let Some(mod_enum) = module {
+        return Ok(vec![(mod_enum, getpwall_module(mod_enum)?)]);
+    }
+
+    // The modules are independent and SSS/winbind each wait on their daemon,
+    // so enumerate them concurrently. Each module keeps its own enumeration
+    // state, so the threads do not share a cursor.
+    std::thread::scope(|scope| {
+        let handles: Vec<_> = [NssModule::Files, NssModule::Sss, NssModule::Winbind]
+            .into_iter()
+            .map(|mod_enum| (mod_enum, scope.spawn(move || getpwall_module(mod_enum))))
+            .collect();
+
+        handles
+            .into_iter()
+            .map(|(mod_enum, handle)| {
+                let entries = handle.join().unwrap_or_else(|e| std::panic::resume_unwind(e))?;
+                Ok((mod_enum, entries))
+            })
+            .collect()
+    })
+}
+
+/// Get all password entries from the specified NSS module(s).
+///
+/// # Errors
+/// Returns `NssError` if NSS operation fails.
+pub fn getpwall(module: Option<NssModule>) -> NssResult<Vec<PasswdEntry>> {
+    let all_entries = getpwall_by_module(module)?
+        .into_iter()
+        .flat_map(|(_, entries)| entries)
+        .collect();
+
     Ok(all_entries)
 }
 
@@ -1,59 +1,148 @@
 use pyo3::prelude::*;
-use pyo3::types::PyDict;
+use pyo3::intern;
+use pyo3::sync::GILOnceCell;
+use pyo3::types::{PyBytes, PyDict, PyList, PyString};
 use libc::gid_t;
 use crate::{GroupEntry, GroupIterator};
 use crate::group::{getgrnam as rust_getgrnam, getgrgid as rust_getgrgid, itergrp as rust_itergrp};
-use super::nss_common::PyNssModule;
+use crate::entry_buffer::{EntryBuffer, ITER_BATCH_SIZE};
+use super::nss_common::{PyNssModule, cached_str, module_upper_name, not_found_error, source_name};
 
-#[pyclass]
-#[derive(Debug, Clone)]
+// Entries are immutable once created, so the class is frozen: attribute access
+// reads through a shared reference without PyO3's runtime borrow tracking.
+#[pyclass(frozen)]
 pub struct PyGroupEntry {
-    #[pyo3(get)]
-    pub gr_name: String,
-    #[pyo3(get)]
-    pub gr_gid: gid_t,
-    #[pyo3(get)]
-    pub gr_mem: Vec<String>,
-    #[pyo3(get)]
-    pub source: String,
+    inner: GroupEntry,
+    // Python objects are only built when an attribute is first read
+    gr_name_py: GILOnceCell<Py<PyString>>,
+    gr_mem_py: GILOnceCell<Py<PyList>>,
+    gr_mem_raw_py: GILOnceCell<Py<PyBytes>>,
+    dict_py: GILOnceCell<Py<PyDict>>,
 }
 
 #[pymethods]
 impl PyGroupEntry {
+    #[getter]
+    fn gr_name<'py>(&self, py: Python<'py>) -> Bound<'py, PyString> {
+        cached_str(py, &self.gr_name_py, &self.inner.gr_name)
+    }
+
+    #[getter]
+    fn gr_gid(&self) -> gid_t {
+        self.inner.gr_gid
+    }
+
+    #[getter]
+    fn gr_mem<'py>(&self, py: Python<'py>) -> PyResult<Bound<'py, PyList>> {
+        let members = self.gr_mem_py.get_or_try_init(py, || {
+            PyList::new(py, &self.inner.gr_mem).map(Bound::unbind)
+        })?;
+        Ok(members.bind(py).clone())
+    }
+
+    /// Group members as a single bytes object of NUL-separated names.
+    ///
+    /// Cheaper than `gr_mem` for very large groups since no per-member
+    /// Python string is created.
+    #[getter]
+    fn gr_mem_raw<'py>(&self, py: Python<'py>) -> PyResult<Bound<'py, PyBytes>> {
+        let raw = self.gr_mem_raw_py.get_or_try_init(py, || {
+            members_to_bytes(py, &self.inner.gr_mem).map(Bound::unbind)
+        })?;
+        Ok(raw.bind(py).clone())
+    }
+
+    #[getter]
+    fn source<'py>(&self, py: Python<'py>) -> Bound<'py, PyString> {
+        source_name(py, &self.inner.source)
+    }
+
     fn __str__(&self) -> String {
-        let members = self.gr_mem.join(",");
-        format!("{}:x:{}:{}", self.gr_name, self.gr_gid, members)
+        let entry = &self.inner;
+        let members = entry.gr_mem.join(",");
+        format!("{}:x:{}:{}", entry.gr_name, entry.gr_gid, members)
     }
 
     fn __repr__(&self) -> String {
+        let entry = &self.inner;
         format!("GroupEntry(name='{}', gid={}, members={:?}, source='{}')",
-                self.gr_name, self.gr_gid, self.gr_mem, self.source)
+                entry.gr_name, entry.gr_gid, entry.gr_mem, entry.source)
     }
 
+    /// Return the entry as a dictionary.
+    ///
+    /// The dictionary is built once per entry and each call returns a shallow
+    /// copy of it. gr_mem is a mutable list, so every copy gets its own list
+    /// holding the same member strings as the gr_mem attribute.
     fn to_dict(&self, py: Python<'_>) -> PyResult<PyObject> {
-        let dict = PyDict::new(py);
-        dict.set_item("gr_name", &self.gr_name)?;
-        dict.set_item("gr_gid", self.gr_gid)?;
-        dict.set_item("gr_mem", &self.gr_mem)?;
-        dict.set_item("source", &self.source)?;
-        Ok(dict.into())
+        let dict = self.dict_py.get_or_try_init(py, || {
+            // gr_mem is only a placeholder here; it is replaced in every copy
+            build_group_dict(py, &self.inner, self.gr_name(py), py.None()).map(Bound::unbind)
+        })?;
+        let members = self.gr_mem(py)?;
+        let copy = dict.bind(py).copy()?;
+        copy.set_item(intern!(py, "gr_mem"), members.get_slice(0, members.len()))?;
+        Ok(copy.into())
     }
 }
 
 impl From<GroupEntry> for PyGroupEntry {
     fn from(entry: GroupEntry) -> Self {
         PyGroupEntry {
-            gr_name: entry.gr_name,
-            gr_gid: entry.gr_gid,
-            gr_mem: entry.gr_mem,
-            source: entry.source,
+            inner: entry,
+            gr_name_py: GILOnceCell::new(),
+            gr_mem_py: GILOnceCell::new(),
+            gr_mem_raw_py: GILOnceCell::new(),
+            dict_py: GILOnceCell::new(),
         }
     }
 }
 
+/// Pack group members into one bytes object, separated by NUL bytes.
+fn members_to_bytes<'py>(py: Python<'py>, members: &[String]) -> PyResult<Bound<'py, PyBytes>> {
+    let len = members.iter().map(String::len).sum::<usize>() + members.len().saturating_sub(1);
+    PyBytes::new_with(py, len, |buf| {
+        // The buffer is zero-filled, so only the names need to be copied in
+        let mut pos = 0;
+        for member in members {
+            buf[pos..pos + member.len()].copy_from_slice(member.as_bytes());
+            pos += member.len() + 1;
+        }
+        Ok(())
+    })
+}
+
+/// Build the dictionary representation of a group entry.
+///
+/// Used directly by `getgrall(as_dict=True)` so that no intermediate
+/// `PyGroupEntry` object is allocated per entry.
+fn group_to_dict<'py>(py: Python<'py>, entry: &GroupEntry) -> PyResult<Bound<'py, PyDict>> {
+    build_group_dict(py, entry, &entry.gr_name, &entry.gr_mem)
+}
+
+/// Build an entry dictionary from the given `gr_name` and `gr_mem` values,
+/// so callers can pass cached Python objects.
+fn build_group_dict<'py, S, M>(
+    py: Python<'py>,
+    entry: &GroupEntry,
+    gr_name: S,
+    gr_mem: M,
+) -> PyResult<Bound<'py, PyDict>>
+where
+    S: IntoPyObject<'py>,
+    M: IntoPyObject<'py>,
+{
+    let dict = PyDict::new(py);
+    dict.set_item(intern!(py, "gr_name"), gr_name)?;
+    dict.set_item(intern!(py, "gr_gid"), entry.gr_gid)?;
+    dict.set_item(intern!(py, "gr_mem"), gr_mem)?;
+    dict.set_item(intern!(py, "source"), source_name(py, &entry.source))?;
+    Ok(dict)
+}
+
 #[pyclass]
 pub struct PyGroupIterator {
-    inner: GroupIterator,
+    inner: EntryBuffer<GroupEntry, GroupIterator>,
 }
 
 #[pymethods]
@@ -63,17 +152,54 @@ impl PyGroupIterator {
     }
 
     fn __next__(mut slf: PyRefMut<Self>) -> PyResult<Option<PyGroupEntry>> {
-        match slf.inner.next() {
+        // Entries are read ahead in batches. NSS enumeration may block on files
+        // or daemon sockets, so other Python threads run while a batch is fetched.
+        let py = slf.py();
+        let inner = &mut slf.inner;
+        let result = if inner.needs_fetch() {
+            py.allow_threads(|| inner.next_entry())
+        } else {
+            inner.next_entry()
+        };
+
+        match result {
             Some(Ok(entry)) => Ok(Some(entry.into())),
             Some(Err(e)) => Err(PyErr::from(e)),
             None => Ok(None),
         }
     }
+
+    /// Return up to `count` entries as a list.
+    ///
+    /// Args:
+    ///     count: Maximum number of entries to return, at least 1
+    ///
+    /// Returns:
+    ///     List of entries; an empty list once the enumeration is exhausted
+    ///
+    /// Raises:
+    ///     ValueError: If count is zero
+    ///     NssError: If the NSS enumeration fails
+    #[pyo3(signature = (count=ITER_BATCH_SIZE, /))]
+    fn next_batch<'py>(mut slf: PyRefMut<'py, Self>, count: usize) -> PyResult<Bound<'py, PyList>> {
+        use pyo3::exceptions::PyValueError;
+
+        // An empty list signals the end of the enumeration, so a zero-sized
+        // batch would be indistinguishable from exhaustion
+        if count == 0 {
+            return Err(PyValueError::new_err("next_batch(): count must be positive"));
+        }
+
+        let py = slf.py();
+        let inner = &mut slf.inner;
+        let entries = py.allow_threads(|| inner.next_batch(count))?;
+        PyList::new(py, entries.into_iter().map(PyGroupEntry::from))
+    }
 }
 
 impl From<GroupIterator> for PyGroupIterator {
     fn from(iterator: GroupIterator) -> Self {
-        PyGroupIterator { inner: iterator }
+        PyGroupIterator { inner: EntryBuffer::new(iterator) }
     }
 }
 
@@ -89,9 +215,8 @@ impl From<GroupIterator> for PyGroupIterator {
 /// Raises:
 ///     KeyError: If the group is not found
 #[pyfunction]
-#[pyo3(signature = (name, *, module=None))]
+#[pyo3(signature = (name, /, *, module=None))]
 pub fn getgrnam(py: Python<'_>, name: &str, module: Option<PyNssModule>) -> PyResult<PyGroupEntry> {
-    use pyo3::exceptions::PyKeyError;
     use crate::{NssError, NssReturnCode};
 
     let nss_module = module.map(|m| m.into());
@@ -99,7 +224,7 @@ pub fn getgrnam(py: Python<'_>, name: &str, module: Option<PyNssModule>) -> PyRe
     match result {
         Ok(entry) => Ok(entry.into()),
         Err(NssError::NssOperationFailed { return_code: NssReturnCode::NotFound, .. }) => {
-            Err(PyKeyError::new_err(format!("getgrnam(): name not found: '{}'", name)))
+            Err(not_found_error(intern!(py, "getgrnam(): name not found")))
         },
         Err(e) => Err(PyErr::from(e)),
     }
@@ -117,9 +242,9 @@ pub fn getgrnam(py: Python<'_>, name: &str, module: Option<PyNssModule>) -> PyRe
 /// Raises:
 ///     KeyError: If the group is not found
 #[pyfunction]
-#[pyo3(signature = (gid, *, module=None))]
+#[pyo3(signature = (gid, /, *, module=None))]
 pub fn getgrgid(py: Python<'_>, gid: &Bound<'_, pyo3::PyAny>, module: Option<PyNssModule>) -> PyResult<PyGroupEntry> {
-    use pyo3::exceptions::{PyKeyError, PyOverflowError};
+    use pyo3::exceptions::PyOverflowError;
     use crate::{NssError, NssReturnCode};
 
     // Try to extract gid_t, convert OverflowError to KeyError
@@ -127,7 +252,7 @@ pub fn getgrgid(py: Python<'_>, gid: &Bound<'_, pyo3::PyAny>, module: Option<PyN
         Ok(val) => val,
         Err(e) if e.is_instance_of::<PyOverflowError>(py) => {
             // OverflowError (e.g., negative values) - treat as not found
-            return Err(PyKeyError::new_err(format!("getgrgid(): gid not found: '{}'", gid)));
+            return Err(not_found_error(intern!(py, "getgrgid(): gid not found")));
         }
         Err(e) => return Err(e),
     };
@@ -137,7 +262,7 @@ pub fn getgrgid(py: Python<'_>, gid: &Bound<'_, pyo3::PyAny>, module: Option<PyN
     match result {
         Ok(entry) => Ok(entry.into()),
         Err(NssError::NssOperationFailed { return_code: NssReturnCode::NotFound, .. }) => {
-            Err(PyKeyError::new_err(format!("getgrgid(): gid not found: '{}'", gid)))
+            Err(not_found_error(intern!(py, "getgrgid(): gid not found")))
         },
         Err(e) => Err(PyErr::from(e)),
     }
@@ -175,57 +300,32 @@ pub fn itergrp(py: Python<'_>, module: PyNssModule) -> PyResult<PyGroupIterator>
 #[pyfunction]
 #[pyo3(signature = (*, module=None, as_dict=false))]
 pub fn getgrall(module: Option<PyNssModule>, as_dict: bool, py: Python<'_>) -> PyResult<PyObject> {
-    use crate::group::getgrall as rust_getgrall;
-    use pyo3::types::PyDict;
+    use crate::group::getgrall_by_module;
 
     // Convert PyNssModule option to NssModule option
     let nss_module = module.map(|m| m.into());
 
-    let entries_result = py.allow_threads(|| rust_getgrall(nss_module));
-    match entries_result {
-        Ok(entries) => {
-            if as_dict {
-                // Return dictionary keyed by uppercase module name
-                let result_dict = PyDict::new(py);
-                let mut entries_by_module: std::collections::HashMap<String, Vec<PyGroupEntry>> = std::collections::HashMap::new();
-
-                for entry in entries {
-                    let source = entry.source.to_uppercase();
-                    let py_entry = PyGroupEntry::from(entry);
-                    entries_by_module.entry(source).or_default().push(py_entry);
-                }
-
-                for (module_name, module_entries) in entries_by_module {
-                    let py_entries: Vec<PyObject> = module_entries.into_iter()
-                        .map(|entry| entry.to_dict(py))
-                        .collect::<PyResult<Vec<_>>>()?;
-                    result_dict.set_item(module_name, py_entries)?;
-                }
-
-                Ok(result_dict.into())
-            } else {
-                // Return dictionary keyed by uppercase module name with PyGroupEntry objects
-                let result_dict = PyDict::new(py);
-                let mut entries_by_module: std::collections::HashMap<String, Vec<PyGroupEntry>> = std::collections::HashMap::new();
-
-                for entry in entries {
-                    let source = entry.source.to_uppercase();
-                    let py_entry = PyGroupEntry::from(entry);
-                    entries_by_module.entry(source).or_default().push(py_entry);
-                }
-
-                for (module_name, module_entries) in entries_by_module {
-                    let py_objects: Vec<PyObject> = module_entries.into_iter()
-                        .map(|entry| Py::new(py, entry).unwrap().into_any())
-                        .collect();
-                    result_dict.set_item(module_name, py_objects)?;
-                }
-
-                Ok(result_dict.into())
-            }
-        }
-        Err(e) => Err(PyErr::from(e)),
+    let entries_by_module = py.allow_threads(|| getgrall_by_module(nss_module))?;
+
+    // Return dictionary keyed by uppercase module name. Each module's entries are
+    // converted in a single pass and handed to Python as one list. PyList::new
+    // allocates the list at its final size from the exact-size iterator and
+    // stores each item without resizing.
+    let result_dict = PyDict::new(py);
+    for (mod_enum, entries) in entries_by_module {
+        let py_entries = if as_dict {
+            let dicts = entries.iter()
+                .map(|entry| group_to_dict(py, entry))
+                .collect::<PyResult<Vec<_>>>()?;
+            PyList::new(py, dicts)?
+        } else {
+            PyList::new(py, entries.into_iter().map(PyGroupEntry::from))?
+        };
+        // Interned keys let later lookups such as result["FILES"] match by identity
+        result_dict.set_item(module_upper_name(py, mod_enum), py_entries)?;
     }
+
+    Ok(result_dict.into())
 }
 
 pub fn init_module(m: &Bound<'_, PyModule>) -> PyResult<()> {
@@ -1,28 +1,32 @@
 use pyo3::prelude::*;
-use pyo3::exceptions::PyException;
+use pyo3::exceptions::{PyException, PyKeyError};
+use pyo3::intern;
+use pyo3::sync::GILOnceCell;
+use pyo3::types::PyString;
 use crate::{NssError as RustNssError, NssModule};
 
-#[pyclass]
-#[derive(Debug, Clone)]
+#[pyclass(frozen, eq, hash)]
+#[derive(Debug, Clone, PartialEq, Eq, Hash)]
 pub struct PyNssModule {
     inner: NssModule,
 }
 
 #[pymethods]
 impl PyNssModule {
+    /// Return the shared class constant for the named module, so
+    /// PyNssModule("files") is PyNssModule.FILES.
     #[new]
-    fn new(name: &str) -> PyResult<Self> {
-        let module = match name.to_lowercase().as_str() {
-            "files" => NssModule::Files,
-            "sss" => NssModule::Sss,
-            "winbind" => NssModule::Winbind,
-            _ => return Err(NssError::new_err(format!("Unknown NSS module: {}", name))),
-        };
-        Ok(PyNssModule { inner: module })
+    fn new(py: Python<'_>, name: &str) -> PyResult<Py<Self>> {
+        let module = NssModule::from_name(name)
+            .ok_or_else(|| NssError::new_err(format!("Unknown NSS module: {}", name)))?;
+        Ok(py.get_type::<Self>()
+            .getattr(module.upper_name())?
+            .downcast_into::<Self>()?
+            .unbind())
     }
 
-    fn __str__(&self) -> String {
-        self.inner.name().to_string()
+    fn __str__<'py>(&self, py: Python<'py>) -> Bound<'py, PyString> {
+        module_name(py, self.inner)
     }
 
     fn __repr__(&self) -> String {
@@ -30,8 +34,8 @@ impl PyNssModule {
     }
 
     #[getter]
-    fn name(&self) -> String {
-        self.inner.name().to_string()
+    fn name<'py>(&self, py: Python<'py>) -> Bound<'py, PyString> {
+        module_name(py, self.inner)
     }
 
     #[classattr]
@@ -56,6 +60,59 @@ impl From<PyNssModule> for NssModule {
     }
 }
 
+/// Interned Python string for the lowercase module name, e.g. "files".
+pub(crate) fn module_name<'py>(py: Python<'py>, module: NssModule) -> Bound<'py, PyString> {
+    match module {
+        NssModule::Files => intern!(py, "files").clone(),
+        NssModule::Sss => intern!(py, "sss").clone(),
+        NssModule::Winbind => intern!(py, "winbind").clone(),
+    }
+}
+
+/// Interned Python string for the uppercase module name, e.g. "FILES".
+pub(crate) fn module_upper_name<'py>(py: Python<'py>, module: NssModule) -> Bound<'py, PyString> {
+    match module {
+        NssModule::Files => intern!(py, "FILES").clone(),
+        NssModule::Sss => intern!(py, "SSS").clone(),
+        NssModule::Winbind => intern!(py, "WINBIND").clone(),
+    }
+}
+
+/// Interned Python string for an entry `source` (uppercase module name).
+///
+/// Entries produced by this library always carry one of the uppercase module
+/// names, anything else falls back to a freshly allocated string.
+pub(crate) fn source_name<'py>(py: Python<'py>, source: &str) -> Bound<'py, PyString> {
+    match source {
+        "FILES" => module_upper_name(py, NssModule::Files),
+        "SSS" => module_upper_name(py, NssModule::Sss),
+        "WINBIND" => module_upper_name(py, NssModule::Winbind),
+        _ => PyString::new(py, source),
+    }
+}
+
+/// Return the Python string for an entry field, creating it on first access.
+///
+/// The string is memoized in `cell`, so repeated attribute access returns the
+/// same object and fields that are never read are never converted.
+pub(crate) fn cached_str<'py>(
+    py: Python<'py>,
+    cell: &GILOnceCell<Py<PyString>>,
+    value: &str,
+) -> Bound<'py, PyString> {
+    cell.get_or_init(py, || PyString::new(py, value).unbind())
+        .bind(py)
+        .clone()
+}
+
+/// KeyError for a lookup miss, e.g. `intern!(py, "getpwnam(): name not found")`.
+///
+/// The message is a static interned string, so a miss does not format or
+/// allocate a message.
+pub(crate) fn not_found_error(message: &Bound<'_, PyString>) -> PyErr {
+    PyKeyError::new_err(message.clone().unbind())
+}
+
 pyo3::create_exception!(truenas_nss, NssError, PyException);
 
 impl From<RustNssError> for PyErr {
@@ -66,6 +123,14 @@ impl From<RustNssError> for PyErr {
 
 pub fn init_module(m: &Bound<'_, PyModule>) -> PyResult<()> {
     m.add_class::<PyNssModule>()?;
+
+    // Expose the class constants at module level as well, so callers can use
+    // nss_common.FILES instead of constructing PyNssModule("files") each time.
+    let module_type = m.py().get_type::<PyNssModule>();
+    for name in ["FILES", "SSS", "WINBIND"] {
+        m.add(name, module_type.getattr(name)?)?;
+    }
+
     m.add("NssError", m.py().get_type::<NssError>())?;
     Ok(())
 }
\ No newline at end of file
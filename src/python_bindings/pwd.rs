@@ -1,73 +1,148 @@
 use pyo3::prelude::*;
-use pyo3::types::PyDict;
-use libc::uid_t;
-use crate::{PasswdEntry, PasswdIterator};
+use pyo3::intern;
+use pyo3::types::{PyBytes, PyDict, PyList, PyString, PyType};
+use pyo3::marker::Ungil;
+use pyo3::sync::GILOnceCell;
+use libc::{gid_t, uid_t};
+use std::sync::atomic::{AtomicBool, Ordering};
+use std::sync::{Arc, Mutex, OnceLock};
+use std::time::Duration;
+use crate::{NssModule, NssResult, PasswdEntry, PasswdIterator, PasswdLookup};
+use crate::lookup_cache::{LookupCache, DEFAULT_CACHE_SIZE, DEFAULT_CACHE_TTL_MS};
 use crate::passwd::{getpwnam as rust_getpwnam, getpwuid as rust_getpwuid, iterpw as rust_iterpw};
-use super::nss_common::PyNssModule;
+use crate::entry_buffer::{EntryBuffer, ITER_BATCH_SIZE};
+use super::nss_common::{PyNssModule, cached_str, module_upper_name, not_found_error, source_name};
 
-#[pyclass]
-#[derive(Debug, Clone)]
+// Entries are immutable once created, so the class is frozen: attribute access
+// reads through a shared reference without PyO3's runtime borrow tracking.
+#[pyclass(frozen)]
 pub struct PyPasswdEntry {
-    #[pyo3(get)]
-    pub pw_name: String,
-    #[pyo3(get)]
-    pub pw_uid: uid_t,
-    #[pyo3(get)]
-    pub pw_gid: uid_t,
-    #[pyo3(get)]
-    pub pw_gecos: String,
-    #[pyo3(get)]
-    pub pw_dir: String,
-    #[pyo3(get)]
-    pub pw_shell: String,
-    #[pyo3(get)]
-    pub source: String,
+    inner: Arc<PasswdEntry>,
+    // Python strings are only built when an attribute is first read
+    pw_name_py: GILOnceCell<Py<PyString>>,
+    pw_gecos_py: GILOnceCell<Py<PyString>>,
+    pw_dir_py: GILOnceCell<Py<PyString>>,
+    pw_shell_py: GILOnceCell<Py<PyString>>,
+    dict_py: GILOnceCell<Py<PyDict>>,
 }
 
 #[pymethods]
 impl PyPasswdEntry {
+    #[getter]
+    fn pw_name<'py>(&self, py: Python<'py>) -> Bound<'py, PyString> {
+        cached_str(py, &self.pw_name_py, &self.inner.pw_name)
+    }
+
+    #[getter]
+    fn pw_uid(&self) -> uid_t {
+        self.inner.pw_uid
+    }
+
+    #[getter]
+    fn pw_gid(&self) -> gid_t {
+        self.inner.pw_gid
+    }
+
+    #[getter]
+    fn pw_gecos<'py>(&self, py: Python<'py>) -> Bound<'py, PyString> {
+        cached_str(py, &self.pw_gecos_py, &self.inner.pw_gecos)
+    }
+
+    #[getter]
+    fn pw_dir<'py>(&self, py: Python<'py>) -> Bound<'py, PyString> {
+        cached_str(py, &self.pw_dir_py, &self.inner.pw_dir)
+    }
+
+    #[getter]
+    fn pw_shell<'py>(&self, py: Python<'py>) -> Bound<'py, PyString> {
+        cached_str(py, &self.pw_shell_py, &self.inner.pw_shell)
+    }
+
+    #[getter]
+    fn source<'py>(&self, py: Python<'py>) -> Bound<'py, PyString> {
+        source_name(py, &self.inner.source)
+    }
+
     fn __str__(&self) -> String {
+        let entry = &self.inner;
         format!("{}:x:{}:{}:{}:{}:{}",
-                self.pw_name, self.pw_uid, self.pw_gid,
-                self.pw_gecos, self.pw_dir, self.pw_shell)
+                entry.pw_name, entry.pw_uid, entry.pw_gid,
+                entry.pw_gecos, entry.pw_dir, entry.pw_shell)
     }
 
     fn __repr__(&self) -> String {
+        let entry = &self.inner;
         format!("PasswdEntry(name='{}', uid={}, gid={}, gecos='{}', dir='{}', shell='{}', source='{}')",
-                self.pw_name, self.pw_uid, self.pw_gid,
-                self.pw_gecos, self.pw_dir, self.pw_shell, self.source)
+                entry.pw_name, entry.pw_uid, entry.pw_gid,
+                entry.pw_gecos, entry.pw_dir, entry.pw_shell, entry.source)
     }
 
+    /// Return the entry as a dictionary.
+    ///
+    /// The dictionary is built once per entry and shares its values with the
+    /// entry attributes; each call returns a shallow copy of it.
     fn to_dict(&self, py: Python<'_>) -> PyResult<PyObject> {
-        let dict = PyDict::new(py);
-        dict.set_item("pw_name", &self.pw_name)?;
-        dict.set_item("pw_uid", self.pw_uid)?;
-        dict.set_item("pw_gid", self.pw_gid)?;
-        dict.set_item("pw_gecos", &self.pw_gecos)?;
-        dict.set_item("pw_dir", &self.pw_dir)?;
-        dict.set_item("pw_shell", &self.pw_shell)?;
-        dict.set_item("source", &self.source)?;
-        Ok(dict.into())
+        let dict = self.dict_py.get_or_try_init(py, || {
+            build_passwd_dict(
+                py,
+                &self.inner,
+                [self.pw_name(py), self.pw_gecos(py), self.pw_dir(py), self.pw_shell(py)],
+            )
+            .map(Bound::unbind)
+        })?;
+        Ok(dict.bind(py).copy()?.into())
     }
 }
 
 impl From<PasswdEntry> for PyPasswdEntry {
     fn from(entry: PasswdEntry) -> Self {
+        Arc::new(entry).into()
+    }
+}
+
+impl From<Arc<PasswdEntry>> for PyPasswdEntry {
+    fn from(entry: Arc<PasswdEntry>) -> Self {
         PyPasswdEntry {
-            pw_name: entry.pw_name,
-            pw_uid: entry.pw_uid,
-            pw_gid: entry.pw_gid,
-            pw_gecos: entry.pw_gecos,
-            pw_dir: entry.pw_dir,
-            pw_shell: entry.pw_shell,
-            source: entry.source,
+            inner: entry,
+            pw_name_py: GILOnceCell::new(),
+            pw_gecos_py: GILOnceCell::new(),
+            pw_dir_py: GILOnceCell::new(),
+            pw_shell_py: GILOnceCell::new(),
+            dict_py: GILOnceCell::new(),
         }
     }
 }
 
+/// Build the dictionary representation of a password entry.
+///
+/// Used directly by `getpwall(as_dict=True)` so that no intermediate
+/// `PyPasswdEntry` object is allocated per entry.
+fn passwd_to_dict<'py>(py: Python<'py>, entry: &PasswdEntry) -> PyResult<Bound<'py, PyDict>> {
+    build_passwd_dict(py, entry, [&entry.pw_name, &entry.pw_gecos, &entry.pw_dir, &entry.pw_shell])
+}
+
+/// Build an entry dictionary, taking the string fields (pw_name, pw_gecos,
+/// pw_dir, pw_shell) from `strings` so callers can pass cached Python strings.
+fn build_passwd_dict<'py, S: IntoPyObject<'py>>(
+    py: Python<'py>,
+    entry: &PasswdEntry,
+    strings: [S; 4],
+) -> PyResult<Bound<'py, PyDict>> {
+    let [pw_name, pw_gecos, pw_dir, pw_shell] = strings;
+    let dict = PyDict::new(py);
+    dict.set_item(intern!(py, "pw_name"), pw_name)?;
+    dict.set_item(intern!(py, "pw_uid"), entry.pw_uid)?;
+    dict.set_item(intern!(py, "pw_gid"), entry.pw_gid)?;
+    dict.set_item(intern!(py, "pw_gecos"), pw_gecos)?;
+    dict.set_item(intern!(py, "pw_dir"), pw_dir)?;
+    dict.set_item(intern!(py, "pw_shell"), pw_shell)?;
+    dict.set_item(intern!(py, "source"), source_name(py, &entry.source))?;
+    Ok(dict)
+}
+
 #[pyclass]
 pub struct PyPasswdIterator {
-    inner: PasswdIterator,
+    inner: EntryBuffer<PasswdEntry, PasswdIterator>,
 }
 
 #[pymethods]
@@ -77,20 +152,99 @@ impl PyPasswdIterator {
     }
 
     fn __next__(mut slf: PyRefMut<Self>) -> PyResult<Option<PyPasswdEntry>> {
-        match slf.inner.next() {
+        // Entries are read ahead in batches. NSS enumeration may block on files
+        // or daemon sockets, so other Python threads run while a batch is fetched.
+        let py = slf.py();
+        let inner = &mut slf.inner;
+        let result = if inner.needs_fetch() {
+            py.allow_threads(|| inner.next_entry())
+        } else {
+            inner.next_entry()
+        };
+
+        match result {
             Some(Ok(entry)) => Ok(Some(entry.into())),
             Some(Err(e)) => Err(PyErr::from(e)),
             None => Ok(None),
         }
     }
+
+    /// Return up to `count` entries as a list.
+    ///
+    /// Args:
+    ///     count: Maximum number of entries to return, at least 1
+    ///
+    /// Returns:
+    ///     List of entries; an empty list once the enumeration is exhausted
+    ///
+    /// Raises:
+    ///     ValueError: If count is zero
+    ///     NssError: If the NSS enumeration fails
+    #[pyo3(signature = (count=ITER_BATCH_SIZE, /))]
+    fn next_batch<'py>(mut slf: PyRefMut<'py, Self>, count: usize) -> PyResult<Bound<'py, PyList>> {
+        use pyo3::exceptions::PyValueError;
+
+        // An empty list signals the end of the enumeration, so a zero-sized
+        // batch would be indistinguishable from exhaustion
+        if count == 0 {
+            return Err(PyValueError::new_err("next_batch(): count must be positive"));
+        }
+
+        let py = slf.py();
+        let inner = &mut slf.inner;
+        let entries = py.allow_threads(|| inner.next_batch(count))?;
+        PyList::new(py, entries.into_iter().map(PyPasswdEntry::from))
+    }
 }
 
 impl From<PasswdIterator> for PyPasswdIterator {
     fn from(iterator: PasswdIterator) -> Self {
-        PyPasswdIterator { inner: iterator }
+        PyPasswdIterator { inner: EntryBuffer::new(iterator) }
     }
 }
 
+/// Key of a passwd lookup within one NSS module selection
+#[derive(Debug, Clone, PartialEq, Eq, Hash)]
+enum PwLookupKey {
+    Name(String),
+    Uid(uid_t),
+}
+
+type PwCacheKey = (Option<NssModule>, PwLookupKey);
+
+/// Whether getpwnam()/getpwuid() consult the lookup cache (disabled by default)
+static PW_CACHE_ENABLED: AtomicBool = AtomicBool::new(false);
+
+/// Process-local cache of passwd lookups, similar to nscd's passwd cache
+static PW_CACHE: OnceLock<Mutex<LookupCache<PwCacheKey, Arc<PasswdEntry>>>> = OnceLock::new();
+
+fn pw_cache() -> &'static Mutex<LookupCache<PwCacheKey, Arc<PasswdEntry>>> {
+    PW_CACHE.get_or_init(|| Mutex::new(LookupCache::new()))
+}
+
+/// Perform a passwd lookup, serving it from the cache when enabled.
+///
+/// The NSS lookup itself runs with the GIL released. Only successful lookups
+/// are cached; misses and errors always go to NSS.
+fn cached_lookup<K, F>(py: Python<'_>, make_key: K, lookup: F) -> NssResult<Arc<PasswdEntry>>
+where
+    K: FnOnce() -> PwCacheKey,
+    F: Ungil + FnOnce() -> NssResult<PasswdEntry>,
+{
+    if !PW_CACHE_ENABLED.load(Ordering::Relaxed) {
+        return py.allow_threads(lookup).map(Arc::new);
+    }
+
+    let key = make_key();
+    if let Some(entry) = pw_cache().lock().unwrap().get(&key) {
+        return Ok(entry);
+    }
+
+    let entry = Arc::new(py.allow_threads(lookup)?);
+    pw_cache().lock().unwrap().insert(key, Arc::clone(&entry));
+    Ok(entry)
+}
+
 /// Return the password database entry for the given user by name.
 ///
 /// Args:
@@ -102,19 +256,47 @@ impl From<PasswdIterator> for PyPasswdIterator {
 ///
 /// Raises:
 ///     KeyError: If the user is not found
+///
+/// Note:
+///     Callers that expect many misses should use try_getpwnam(), which
+///     returns None instead of raising.
 #[pyfunction]
-#[pyo3(signature = (name, *, module=None))]
+#[pyo3(signature = (name, /, *, module=None))]
 pub fn getpwnam(py: Python<'_>, name: &str, module: Option<PyNssModule>) -> PyResult<PyPasswdEntry> {
-    use pyo3::exceptions::PyKeyError;
+    match try_getpwnam(py, name, module)? {
+        Some(entry) => Ok(entry),
+        None => Err(not_found_error(intern!(py, "getpwnam(): name not found"))),
+    }
+}
+
+/// Return the password database entry for the given user by name, or None.
+///
+/// Same as getpwnam(), but a missing user is reported by returning None
+/// instead of raising KeyError, which avoids creating an exception per miss.
+///
+/// Args:
+///     name: Username to look up
+///     module: NSS module from which to retrieve the user
+///
+/// Returns:
+///     PyPasswdEntry or None: Password database entry, None if not found
+///
+/// Raises:
+///     NssError: If the NSS lookup fails
+#[pyfunction]
+#[pyo3(signature = (name, /, *, module=None))]
+pub fn try_getpwnam(py: Python<'_>, name: &str, module: Option<PyNssModule>) -> PyResult<Option<PyPasswdEntry>> {
     use crate::{NssError, NssReturnCode};
 
     let nss_module = module.map(|m| m.into());
-    let result = py.allow_threads(|| rust_getpwnam(name, nss_module));
+    let result = cached_lookup(
+        py,
+        || (nss_module, PwLookupKey::Name(name.to_string())),
+        || rust_getpwnam(name, nss_module),
+    );
     match result {
-        Ok(entry) => Ok(entry.into()),
-        Err(NssError::NssOperationFailed { return_code: NssReturnCode::NotFound, .. }) => {
-            Err(PyKeyError::new_err(format!("getpwnam(): name not found: '{}'", name)))
-        },
+        Ok(entry) => Ok(Some(entry.into())),
+        Err(NssError::NssOperationFailed { return_code: NssReturnCode::NotFound, .. }) => Ok(None),
         Err(e) => Err(PyErr::from(e)),
     }
 }
@@ -131,9 +313,9 @@ pub fn getpwnam(py: Python<'_>, name: &str, module: Option<PyNssModule>) -> PyRe
 /// Raises:
 ///     KeyError: If the user is not found
 #[pyfunction]
-#[pyo3(signature = (uid, *, module=None))]
+#[pyo3(signature = (uid, /, *, module=None))]
 pub fn getpwuid(py: Python<'_>, uid: &Bound<'_, pyo3::PyAny>, module: Option<PyNssModule>) -> PyResult<PyPasswdEntry> {
-    use pyo3::exceptions::{PyKeyError, PyOverflowError};
+    use pyo3::exceptions::PyOverflowError;
     use crate::{NssError, NssReturnCode};
 
     // Try to extract uid_t, convert OverflowError to KeyError
@@ -141,22 +323,107 @@ pub fn getpwuid(py: Python<'_>, uid: &Bound<'_, pyo3::PyAny>, module: Option<PyN
         Ok(val) => val,
         Err(e) if e.is_instance_of::<PyOverflowError>(py) => {
             // OverflowError (e.g., negative values) - treat as not found
-            return Err(PyKeyError::new_err(format!("getpwuid(): uid not found: '{}'", uid)));
+            return Err(not_found_error(intern!(py, "getpwuid(): uid not found")));
         }
         Err(e) => return Err(e),
     };
 
     let nss_module = module.map(|m| m.into());
-    let result = py.allow_threads(|| rust_getpwuid(uid_val, nss_module));
+    let result = cached_lookup(
+        py,
+        || (nss_module, PwLookupKey::Uid(uid_val)),
+        || rust_getpwuid(uid_val, nss_module),
+    );
     match result {
         Ok(entry) => Ok(entry.into()),
         Err(NssError::NssOperationFailed { return_code: NssReturnCode::NotFound, .. }) => {
-            Err(PyKeyError::new_err(format!("getpwuid(): uid not found: '{}'", uid)))
+            Err(not_found_error(intern!(py, "getpwuid(): uid not found")))
         },
         Err(e) => Err(PyErr::from(e)),
     }
 }
 
+/// Prepared getpwnam() lookup bound to a single NSS module.
+///
+/// Created by compile_lookup(). The module's getpwnam_r is resolved once and
+/// its result buffer is reused across calls.
+#[pyclass(frozen)]
+pub struct PreparedPwLookup {
+    inner: Mutex<PasswdLookup>,
+    module: NssModule,
+}
+
+#[pymethods]
+impl PreparedPwLookup {
+    /// Return the password database entry for the given user by name.
+    ///
+    /// Raises:
+    ///     KeyError: If the user is not found
+    #[pyo3(signature = (name, /))]
+    fn __call__(&self, py: Python<'_>, name: &str) -> PyResult<PyPasswdEntry> {
+        match py.allow_threads(|| self.inner.lock().unwrap().getpwnam(name))? {
+            Some(entry) => Ok(entry.into()),
+            None => Err(not_found_error(intern!(py, "getpwnam(): name not found"))),
+        }
+    }
+
+    #[getter]
+    fn module(&self) -> PyNssModule {
+        self.module.into()
+    }
+
+    fn __repr__(&self) -> String {
+        format!("PreparedPwLookup(module='{}')", self.module.name())
+    }
+}
+
+/// Prepare repeated getpwnam() lookups against a single NSS module.
+///
+/// Args:
+///     module: NSS module from which to retrieve users
+///
+/// Returns:
+///     PreparedPwLookup: Callable taking a username and returning a PyPasswdEntry
+///
+/// Raises:
+///     NssError: If the NSS module cannot be loaded
+///
+/// Note:
+///     Prepared lookups query the module directly and bypass the cache
+///     configured with set_cache().
+#[pyfunction]
+#[pyo3(signature = (module, /))]
+pub fn compile_lookup(module: PyNssModule) -> PyResult<PreparedPwLookup> {
+    let nss_module = module.into();
+    Ok(PreparedPwLookup {
+        inner: Mutex::new(PasswdLookup::new(nss_module)?),
+        module: nss_module,
+    })
+}
+
+/// Configure the process-local cache used by getpwnam() and getpwuid().
+///
+/// Args:
+///     enabled: serve repeated lookups from the cache
+///     max_entries: maximum number of cached entries
+///     ttl_ms: milliseconds after which a cached entry is looked up again
+///
+/// Note:
+///     The cache is disabled by default. Reconfiguring the cache drops all
+///     cached entries. Only successful lookups are cached.
+#[pyfunction]
+#[pyo3(signature = (enabled, max_entries=DEFAULT_CACHE_SIZE, ttl_ms=DEFAULT_CACHE_TTL_MS))]
+pub fn set_cache(enabled: bool, max_entries: usize, ttl_ms: u64) {
+    pw_cache().lock().unwrap().configure(max_entries, Duration::from_millis(ttl_ms));
+    PW_CACHE_ENABLED.store(enabled, Ordering::Relaxed);
+}
+
+/// Drop all entries from the getpwnam()/getpwuid() lookup cache.
+#[pyfunction]
+pub fn cache_clear() {
+    pw_cache().lock().unwrap().clear();
+}
+
 /// Generator that yields password entries on server
 ///
 /// Args:
@@ -189,65 +456,83 @@ pub fn iterpw(py: Python<'_>, module: PyNssModule) -> PyResult<PyPasswdIterator>
 #[pyfunction]
 #[pyo3(signature = (*, module=None, as_dict=false))]
 pub fn getpwall(module: Option<PyNssModule>, as_dict: bool, py: Python<'_>) -> PyResult<PyObject> {
-    use crate::passwd::getpwall as rust_getpwall;
-    use pyo3::types::PyDict;
+    use crate::passwd::getpwall_by_module;
 
     // Convert PyNssModule option to NssModule option
     let nss_module = module.map(|m| m.into());
 
-    let entries_result = py.allow_threads(|| rust_getpwall(nss_module));
-    match entries_result {
-        Ok(entries) => {
-            if as_dict {
-                // Return dictionary keyed by uppercase module name
-                let result_dict = PyDict::new(py);
-                let mut entries_by_module: std::collections::HashMap<String, Vec<PyPasswdEntry>> = std::collections::HashMap::new();
-
-                for entry in entries {
-                    let source = entry.source.to_uppercase();
-                    let py_entry = PyPasswdEntry::from(entry);
-                    entries_by_module.entry(source).or_default().push(py_entry);
-                }
-
-                for (module_name, module_entries) in entries_by_module {
-                    let py_entries: Vec<PyObject> = module_entries.into_iter()
-                        .map(|entry| entry.to_dict(py))
-                        .collect::<PyResult<Vec<_>>>()?;
-                    result_dict.set_item(module_name, py_entries)?;
-                }
-
-                Ok(result_dict.into())
-            } else {
-                // Return dictionary keyed by uppercase module name with PyPasswdEntry objects
-                let result_dict = PyDict::new(py);
-                let mut entries_by_module: std::collections::HashMap<String, Vec<PyPasswdEntry>> = std::collections::HashMap::new();
-
-                for entry in entries {
-                    let source = entry.source.to_uppercase();
-                    let py_entry = PyPasswdEntry::from(entry);
-                    entries_by_module.entry(source).or_default().push(py_entry);
-                }
-
-                for (module_name, module_entries) in entries_by_module {
-                    let py_objects: Vec<PyObject> = module_entries.into_iter()
-                        .map(|entry| Py::new(py, entry).unwrap().into_any())
-                        .collect();
-                    result_dict.set_item(module_name, py_objects)?;
-                }
-
-                Ok(result_dict.into())
-            }
-        }
-        Err(e) => Err(PyErr::from(e)),
+    let entries_by_module = py.allow_threads(|| getpwall_by_module(nss_module))?;
+
+    // Return dictionary keyed by uppercase module name. Each module's entries are
+    // converted in a single pass and handed to Python as one list. PyList::new
+    // allocates the list at its final size from the exact-size iterator and
+    // stores each item without resizing.
+    let result_dict = PyDict::new(py);
+    for (mod_enum, entries) in entries_by_module {
+        let py_entries = if as_dict {
+            let dicts = entries.iter()
+                .map(|entry| passwd_to_dict(py, entry))
+                .collect::<PyResult<Vec<_>>>()?;
+            PyList::new(py, dicts)?
+        } else {
+            PyList::new(py, entries.into_iter().map(PyPasswdEntry::from))?
+        };
+        // Interned keys let later lookups such as result["FILES"] match by identity
+        result_dict.set_item(module_upper_name(py, mod_enum), py_entries)?;
     }
+
+    Ok(result_dict.into())
+}
+
+/// Build an `array.array('I')` (C unsigned int, the width of uid_t/gid_t).
+fn id_array<'py>(py: Python<'py>, ids: impl Iterator<Item = u32>) -> PyResult<Bound<'py, PyAny>> {
+    static ARRAY_TYPE: GILOnceCell<Py<PyType>> = GILOnceCell::new();
+
+    let raw: Vec<u8> = ids.flat_map(u32::to_ne_bytes).collect();
+    ARRAY_TYPE
+        .import(py, "array", "array")?
+        .call1((intern!(py, "I"), PyBytes::new(py, &raw)))
+}
+
+/// Returns all password entries of an NSS module as columns.
+///
+/// Args:
+///     module: NSS module from which to retrieve the entries
+///
+/// Returns:
+///     dict: Dictionary of columns keyed by field name. pw_uid and pw_gid are
+///           array.array('I') objects, which support the buffer protocol
+///           (e.g. numpy.frombuffer); the string fields are lists.
+#[pyfunction]
+#[pyo3(signature = (module=PyNssModule::FILES))]
+pub fn getpwall_arrays(py: Python<'_>, module: PyNssModule) -> PyResult<Bound<'_, PyDict>> {
+    use crate::passwd::getpwall as rust_getpwall;
+
+    let nss_module = module.into();
+    let entries = py.allow_threads(|| rust_getpwall(Some(nss_module)))?;
+
+    let columns = PyDict::new(py);
+    columns.set_item(intern!(py, "pw_name"), PyList::new(py, entries.iter().map(|e| &e.pw_name))?)?;
+    columns.set_item(intern!(py, "pw_uid"), id_array(py, entries.iter().map(|e| e.pw_uid))?)?;
+    columns.set_item(intern!(py, "pw_gid"), id_array(py, entries.iter().map(|e| e.pw_gid))?)?;
+    columns.set_item(intern!(py, "pw_gecos"), PyList::new(py, entries.iter().map(|e| &e.pw_gecos))?)?;
+    columns.set_item(intern!(py, "pw_dir"), PyList::new(py, entries.iter().map(|e| &e.pw_dir))?)?;
+    columns.set_item(intern!(py, "pw_shell"), PyList::new(py, entries.iter().map(|e| &e.pw_shell))?)?;
+    Ok(columns)
 }
 
 pub fn init_module(m: &Bound<'_, PyModule>) -> PyResult<()> {
     m.add_class::<PyPasswdEntry>()?;
     m.add_class::<PyPasswdIterator>()?;
+    m.add_class::<PreparedPwLookup>()?;
     m.add_function(wrap_pyfunction!(getpwnam, m)?)?;
+    m.add_function(wrap_pyfunction!(try_getpwnam, m)?)?;
     m.add_function(wrap_pyfunction!(getpwuid, m)?)?;
+    m.add_function(wrap_pyfunction!(compile_lookup, m)?)?;
     m.add_function(wrap_pyfunction!(iterpw, m)?)?;
     m.add_function(wrap_pyfunction!(getpwall, m)?)?;
+    m.add_function(wrap_pyfunction!(getpwall_arrays, m)?)?;
+    m.add_function(wrap_pyfunction!(set_cache, m)?)?;
+    m.add_function(wrap_pyfunction!(cache_clear, m)?)?;
     Ok(())
 }
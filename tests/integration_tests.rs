@@ -1,4 +1,4 @@
-use truenas_rust_nss::{getpwnam, getpwuid, getgrnam, getgrgid, getpwall, getgrall, iterpw, itergrp, NssModule};
+use truenas_rust_nss::{getpwnam, getpwuid, getgrnam, getgrgid, getpwall, getgrall, iterpw, itergrp, NssModule, PasswdLookup};
 
 #[cfg(test)]
 mod integration_tests {
@@ -205,6 +205,25 @@ mod integration_tests {
         }
     }
 
+    #[test]
+    #[ignore = "Requires system NSS libraries and root user"]
+    fn test_prepared_passwd_lookup() {
+        match PasswdLookup::new(NssModule::Files) {
+            Ok(mut lookup) => {
+                // Repeated lookups reuse the same buffer
+                for _ in 0..2 {
+                    let user = lookup.getpwnam("root").unwrap().expect("root user");
+                    assert_eq!(user.pw_name, "root");
+                    assert_eq!(user.pw_uid, 0);
+                }
+                assert!(lookup.getpwnam("nonexistent_user_12345").unwrap().is_none());
+            }
+            Err(e) => {
+                eprintln!("Warning: prepared lookup test failed (may be expected if NSS modules not available): {}", e);
+            }
+        }
+    }
+
     #[test]
     fn test_nonexistent_group() {
         // This test should work even without NSS libraries, as it tests error handling
@@ -24,6 +24,15 @@ class TestNssCommon:
         assert hasattr(nss_common.PyNssModule, 'SSS')
         assert hasattr(nss_common.PyNssModule, 'WINBIND')
 
+    def test_nss_module_singletons(self):
+        """Test module-level NssModule constants"""
+        assert nss_common.FILES is nss_common.PyNssModule.FILES
+        assert nss_common.SSS is nss_common.PyNssModule.SSS
+        assert nss_common.WINBIND is nss_common.PyNssModule.WINBIND
+        assert nss_common.PyNssModule("FILES") == nss_common.FILES
+        assert nss_common.PyNssModule("files") is nss_common.FILES
+        assert nss_common.PyNssModule("sss") is nss_common.SSS
+
     def test_nss_error_exists(self):
         """Test that NssError exception exists"""
         assert hasattr(nss_common, 'NssError')
@@ -71,6 +80,11 @@ class TestPwd:
             entry_dict = entry.to_dict()
             assert entry_dict['pw_name'] == "root"
             assert entry_dict['pw_uid'] == 0
+            assert entry_dict['pw_name'] is entry.pw_name
+
+            # Mutating the returned dict must not affect later calls
+            entry_dict['pw_name'] = "changed"
+            assert entry.to_dict()['pw_name'] == "root"
         except nss_common.NssError as e:
             # It's okay if root doesn't exist in the test environment
             pytest.skip(f"Root user not found: {e}")
@@ -90,6 +104,53 @@ class TestPwd:
         with pytest.raises(KeyError):
             pwd.getpwnam("nonexistent_user_12345")
 
+    def test_try_getpwnam(self):
+        """Test try_getpwnam returning None for a missing user"""
+        assert pwd.try_getpwnam("nonexistent_user_12345") is None
+        try:
+            entry = pwd.try_getpwnam("root")
+            assert entry is not None
+            assert entry.pw_uid == 0
+        except nss_common.NssError as e:
+            pytest.skip(f"Root user not found: {e}")
+
+    def test_compile_lookup(self):
+        """Test prepared getpwnam lookups"""
+        try:
+            files_module = nss_common.PyNssModule("files")
+            lookup = pwd.compile_lookup(files_module)
+            assert lookup.module == files_module
+
+            for _ in range(2):
+                entry = lookup("root")
+                assert entry.pw_name == "root"
+                assert entry.pw_uid == 0
+                assert entry.source == "FILES"
+
+            with pytest.raises(KeyError):
+                lookup("nonexistent_user_12345")
+        except nss_common.NssError as e:
+            pytest.skip(f"Root user not found: {e}")
+
+    def test_lookup_cache(self):
+        """Test getpwnam/getpwuid lookup cache"""
+        try:
+            pwd.set_cache(True, max_entries=16, ttl_ms=60000)
+            first = pwd.getpwnam("root")
+            second = pwd.getpwnam("root")
+            assert first.to_dict() == second.to_dict()
+            assert pwd.getpwuid(0).pw_name == "root"
+
+            pwd.cache_clear()
+            assert pwd.getpwnam("root").pw_uid == 0
+
+            with pytest.raises(KeyError):
+                pwd.getpwnam("nonexistent_user_12345")
+        except nss_common.NssError as e:
+            pytest.skip(f"Root user not found: {e}")
+        finally:
+            pwd.set_cache(False)
+
     def test_passwd_iterator(self):
         """Test passwd iterator functionality"""
         try:
@@ -116,6 +177,27 @@ class TestPwd:
         except nss_common.NssError as e:
             pytest.skip(f"Iterator test failed: {e}")
 
+    def test_passwd_iterator_next_batch(self):
+        """Test fetching passwd entries from an iterator in batches"""
+        try:
+            files_module = nss_common.PyNssModule("files")
+            expected = [e.pw_name for e in pwd.iterpw(files_module)]
+
+            iterator = pwd.iterpw(files_module)
+            names = [next(iterator).pw_name] if expected else []
+            while batch := iterator.next_batch(2):
+                assert len(batch) <= 2
+                names.extend(e.pw_name for e in batch)
+
+            assert names == expected
+            assert iterator.next_batch() == []
+
+            with pytest.raises(ValueError):
+                pwd.iterpw(files_module).next_batch(0)
+
+        except nss_common.NssError as e:
+            pytest.skip(f"Iterator test failed: {e}")
+
     def test_getpwall(self):
         """Test getpwall functionality"""
         try:
@@ -151,6 +233,22 @@ class TestPwd:
         except nss_common.NssError as e:
             pytest.skip(f"getpwall test failed: {e}")
 
+    def test_getpwall_arrays(self):
+        """Test columnar getpwall_arrays functionality"""
+        try:
+            files_module = nss_common.PyNssModule("files")
+            columns = pwd.getpwall_arrays(files_module)
+            entries = pwd.getpwall(module=files_module)["FILES"]
+
+            assert columns["pw_uid"].typecode == "I"
+            assert list(columns["pw_uid"]) == [e.pw_uid for e in entries]
+            assert list(columns["pw_gid"]) == [e.pw_gid for e in entries]
+            assert columns["pw_name"] == [e.pw_name for e in entries]
+            assert len(columns["pw_shell"]) == len(entries)
+
+        except nss_common.NssError as e:
+            pytest.skip(f"getpwall_arrays test failed: {e}")
+
 
 class TestGrp:
     """Test grp module functionality"""
@@ -178,6 +276,7 @@ class TestGrp:
             assert hasattr(entry, 'gr_mem')
             assert hasattr(entry, 'source')
             assert isinstance(entry.gr_mem, list)
+            assert entry.gr_mem_raw == "\0".join(entry.gr_mem).encode()
 
             # Test string representation
             assert "root" in str(entry)
@@ -188,6 +287,16 @@ class TestGrp:
             assert entry_dict['gr_name'] == "root"
             assert entry_dict['gr_gid'] == 0
             assert isinstance(entry_dict['gr_mem'], list)
+
+            # The member list is a copy sharing the entry's member strings
+            assert entry_dict['gr_mem'] is not entry.gr_mem
+            assert all(a is b for a, b in zip(entry_dict['gr_mem'], entry.gr_mem))
+
+            # Mutating the returned member list must not affect the entry
+            members = list(entry.gr_mem)
+            entry_dict['gr_mem'].append("changed")
+            assert entry.gr_mem == members
+            assert entry.to_dict()['gr_mem'] == members
         except nss_common.NssError as e:
             # It's okay if root group doesn't exist in the test environment
             pytest.skip(f"Root group not found: {e}")